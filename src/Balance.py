@@ -0,0 +1,412 @@
+"""Balance-tuning sweep for the Dytoria Game."""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from Dystoria import StealthTactic, load_data_tsv, simulate_fight
+
+# Version of the simulation rules, part of every cache key so that cached
+# results are not reused after the rules change.
+SIMULATION_VERSION = 1
+
+PLAYER_HEALTH = 200
+
+# Fields that can be swept for each kind of data, with their types.
+FIELDS: Dict[str, Dict[str, type]] = {
+    "bow": {"MinDmg": int, "MaxDmg": int},
+    "quiver": {"Qty": int},
+    "enemy": {"Health": int, "Damage": int},
+    "tactic": {
+        "Visibility": int,
+        "HealthCost": int,
+        "DamageMultiplier": float,
+    },
+}
+
+DATA_FILES = {
+    "bow": "data/spellcaster_bows.tsv",
+    "quiver": "data/mystic_quivers.tsv",
+    "enemy": "data/enemies.tsv",
+    "tactic": "data/stealth_tactics.tsv",
+}
+
+Config = Dict[str, Dict[str, Dict[str, Any]]]
+Matchup = Tuple[str, str, str, str]
+
+
+def load_base_config() -> Config:
+    """Load the balance parameters from the data files."""
+    config: Config = {}
+    for kind, filename in DATA_FILES.items():
+        config[kind] = {
+            row["Name"]: {
+                field: cast(row[field]) for field, cast in FIELDS[kind].items()
+            }
+            for row in load_data_tsv(filename)
+        }
+    return config
+
+
+def load_matchups() -> List[Matchup]:
+    """List every (bow, quiver, enemy, tactic) a sanctuary allows."""
+    tactics = [row["Name"] for row in load_data_tsv(DATA_FILES["tactic"])]
+    matchups: Set[Matchup] = set()
+    for data in load_data_tsv("data/sanctuaries.tsv"):
+        matchups.update(
+            itertools.product(
+                data["Bows"].split(", "),
+                data["Quivers"].split(", "),
+                data["Enemies"].split(", "),
+                tactics,
+            )
+        )
+    return sorted(matchups)
+
+
+def parse_key(key: str) -> Tuple[str, str, str]:
+    """Split a parameter key like "enemy.Dragon.Health" into its parts."""
+    kind, rest = key.split(".", 1)
+    name, field = rest.rsplit(".", 1)
+    if kind not in FIELDS or field not in FIELDS[kind]:
+        raise ValueError(f"Unknown parameter: {key}")
+    return kind, name, field
+
+
+def apply_overrides(base: Config, overrides: Dict[str, Any]) -> Config:
+    """Return a copy of the config with overridden parameters.
+
+    Raises:
+        ValueError: If a parameter is unknown or the config is invalid.
+    """
+    config = {
+        kind: {name: dict(fields) for name, fields in entries.items()}
+        for kind, entries in base.items()
+    }
+    for key, value in overrides.items():
+        kind, name, field = parse_key(key)
+        if name not in config[kind]:
+            raise ValueError(f"Unknown {kind}: {name}")
+        config[kind][name][field] = FIELDS[kind][field](value)
+    for name, bow in config["bow"].items():
+        if bow["MinDmg"] > bow["MaxDmg"]:
+            raise ValueError(
+                f"{name} MinDmg {bow['MinDmg']} is above MaxDmg "
+                f"{bow['MaxDmg']}"
+            )
+    return config
+
+
+def grid_candidates(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Build every combination of the values in a parameter grid."""
+    keys = sorted(grid)
+    return [
+        dict(zip(keys, values, strict=True))
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def random_candidates(
+    ranges: Dict[str, Tuple[Any, Any]], samples: int, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Sample parameters uniformly from inclusive (low, high) ranges."""
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(samples):
+        candidate: Dict[str, Any] = {}
+        for key in sorted(ranges):
+            kind, _, field = parse_key(key)
+            low, high = ranges[key]
+            if FIELDS[kind][field] is int:
+                candidate[key] = rng.randint(int(low), int(high))
+            else:
+                candidate[key] = round(rng.uniform(low, high), 2)
+        candidates.append(candidate)
+    return candidates
+
+
+def matchup_params(
+    config: Config, matchup: Matchup, trials: int, seed: int
+) -> Dict[str, Any]:
+    """Collect everything that determines the result of a matchup."""
+    bow, quiver, enemy, tactic = matchup
+    return {
+        "version": SIMULATION_VERSION,
+        "player_health": PLAYER_HEALTH,
+        "bow": config["bow"][bow],
+        "quiver": config["quiver"][quiver],
+        "enemy": config["enemy"][enemy],
+        "tactic": config["tactic"][tactic],
+        "trials": trials,
+        "seed": seed,
+    }
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """Return a content hash of the matchup parameters."""
+    text = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def simulate_matchup(params: Dict[str, Any]) -> float:
+    """Return the win rate of a matchup over its number of trials."""
+    bow, quiver = params["bow"], params["quiver"]
+    enemy, tactic_data = params["enemy"], params["tactic"]
+    tactic = StealthTactic(
+        "Sweep Tactic",
+        tactic_data["Visibility"],
+        tactic_data["HealthCost"],
+        tactic_data["DamageMultiplier"],
+    )
+    trials: int = params["trials"]
+    rng = random.Random(params["seed"])
+    wins = 0
+    for _ in range(trials):
+        outcome = simulate_fight(
+            params["player_health"],
+            bow["MinDmg"],
+            bow["MaxDmg"],
+            enemy["Health"],
+            enemy["Damage"],
+            tactic,
+            rng,
+            quiver_qty=quiver["Qty"],
+        )
+        if outcome.result == "win":
+            wins += 1
+    return wins / trials
+
+
+class ResultCache:
+    """On-disk cache of matchup win rates keyed by content hash."""
+
+    def __init__(self, directory: str):
+        """Initialize with the directory holding the cached results."""
+        self.directory = directory
+
+    def path(self, key: str) -> str:
+        """Return the file path for a cache key."""
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[float]:
+        """Return a cached win rate, or None if it is missing."""
+        try:
+            with open(self.path(key), encoding="utf-8") as file:
+                return float(json.load(file)["win_rate"])
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, win_rate: float) -> None:
+        """Store a win rate in the cache."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump({"win_rate": win_rate}, file)
+        os.replace(tmp, path)
+
+
+def run_sweep(
+    candidates: List[Dict[str, Any]],
+    targets: Dict[str, float],
+    trials: int = 200,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> List[Dict[str, Any]]:
+    """Evaluate candidates and rank them against target win rates.
+
+    Every matchup of every candidate is looked up in the cache first. Only
+    the distinct matchups that are missing are simulated, in a process
+    pool. Candidates are ranked by the squared error between each enemy's
+    win rate and its target. Invalid candidates are not simulated and are
+    ranked last, with the reason in their "error".
+    """
+    base = load_base_config()
+    matchups = load_matchups()
+
+    plans = []
+    invalid: List[Dict[str, Any]] = []
+    pending: Dict[str, Dict[str, Any]] = {}
+    rates: Dict[str, float] = {}
+    for overrides in candidates:
+        try:
+            config = apply_overrides(base, overrides)
+        except ValueError as e:
+            invalid.append(
+                {
+                    "overrides": overrides,
+                    "win_rates": {},
+                    "score": math.inf,
+                    "error": str(e),
+                }
+            )
+            continue
+        keys = []
+        for matchup in matchups:
+            params = matchup_params(config, matchup, trials, seed)
+            key = cache_key(params)
+            keys.append(key)
+            if key in rates or key in pending:
+                continue
+            cached = cache.get(key) if cache else None
+            if cached is None:
+                pending[key] = params
+            else:
+                rates[key] = cached
+        plans.append((overrides, keys))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(simulate_matchup, pending.values(), chunksize=8)
+            for key, win_rate in zip(pending, results, strict=True):
+                rates[key] = win_rate
+                if cache:
+                    cache.put(key, win_rate)
+
+    report: List[Dict[str, Any]] = []
+    for overrides, keys in plans:
+        by_enemy: Dict[str, List[float]] = {}
+        for matchup, key in zip(matchups, keys, strict=True):
+            by_enemy.setdefault(matchup[2], []).append(rates[key])
+        win_rates = {
+            enemy: sum(values) / len(values)
+            for enemy, values in by_enemy.items()
+        }
+        score = sum(
+            (win_rates.get(enemy, 0.0) - target) ** 2
+            for enemy, target in targets.items()
+        )
+        report.append(
+            {"overrides": overrides, "win_rates": win_rates, "score": score}
+        )
+    report.sort(key=lambda entry: entry["score"])
+    return report + invalid
+
+
+def format_report(report: List[Dict[str, Any]], top: int = 10) -> str:
+    """Format the best entries of a ranked report."""
+    lines = []
+    for rank, entry in enumerate(report[:top], start=1):
+        overrides = ", ".join(
+            f"{key}={value}" for key, value in entry["overrides"].items()
+        )
+        if "error" in entry:
+            lines.append(f"{rank}. invalid | {overrides} | {entry['error']}")
+            continue
+        rates = ", ".join(
+            f"{enemy}: {rate:.2f}"
+            for enemy, rate in sorted(entry["win_rates"].items())
+        )
+        lines.append(
+            f"{rank}. score {entry['score']:.4f} | {overrides or 'baseline'}"
+            f" | {rates}"
+        )
+    return "\n".join(lines)
+
+
+def parse_assignment(text: str) -> Tuple[str, str]:
+    """Split a "key=value" command-line argument."""
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected key=value: {text}")
+    return key, value
+
+
+def parse_value(base: Config, key: str, text: str) -> Any:
+    """Convert a command-line value of a parameter, checking its key."""
+    kind, name, field = parse_key(key)
+    if name not in base[kind]:
+        raise ValueError(f"Unknown {kind}: {name}")
+    try:
+        return FIELDS[kind][field](text)
+    except ValueError:
+        raise ValueError(f"Invalid value for {key}: {text}") from None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a sweep from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--grid",
+        type=parse_assignment,
+        action="append",
+        default=[],
+        help='grid values, e.g. "enemy.Dragon.Health=150,200,250"',
+    )
+    parser.add_argument(
+        "--range",
+        type=parse_assignment,
+        action="append",
+        default=[],
+        help='random search range, e.g. "bow.Ice Bow.MaxDmg=25:40"',
+    )
+    parser.add_argument(
+        "--target",
+        type=parse_assignment,
+        action="append",
+        default=[],
+        help='target win rate, e.g. "Dragon=0.5"',
+    )
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", default=".balance_cache")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    base = load_base_config()
+    try:
+        grid = {
+            key: [parse_value(base, key, text) for text in value.split(",")]
+            for key, value in args.grid
+        }
+        ranges = {}
+        for key, value in args.range:
+            bounds = value.split(":")
+            if len(bounds) != 2:
+                raise ValueError(f"Expected low:high for {key}: {value}")
+            low, high = (parse_value(base, key, text) for text in bounds)
+            if low > high:
+                raise ValueError(f"Empty range for {key}: {value}")
+            ranges[key] = (low, high)
+        targets = {}
+        for enemy, rate in args.target:
+            if enemy not in base["enemy"]:
+                raise ValueError(f"Unknown enemy: {enemy}")
+            try:
+                targets[enemy] = float(rate)
+            except ValueError:
+                raise ValueError(
+                    f"Invalid target for {enemy}: {rate}"
+                ) from None
+    except ValueError as e:
+        parser.error(str(e))
+
+    candidates = grid_candidates(grid)
+    if ranges:
+        sampled = random_candidates(ranges, args.samples, args.seed)
+        candidates = [
+            {**fixed, **extra} for fixed in candidates for extra in sampled
+        ]
+
+    report = run_sweep(
+        candidates,
+        targets,
+        trials=args.trials,
+        seed=args.seed,
+        workers=args.workers,
+        cache=ResultCache(args.cache),
+    )
+    print(format_report(report, args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 """This is our Dytoria Game."""
 
 import csv
+import heapq
+import math
 import random
 import sys
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from Stats import StatsStore
 
 
 class NamedObject:
@@ -91,6 +97,39 @@ class MysticQuiver(NamedObject):
         return self.qty
 
 
+class StealthTactic(NamedObject):
+    """Class representing a tactic used to reduce visibility."""
+
+    def __init__(
+        self,
+        name: str,
+        visibility: int,
+        health_cost: int,
+        damage_multiplier: float,
+        message: str = "",
+    ):
+        """Initialize with visibility change, health cost and multiplier."""
+        super().__init__(name)
+        self.visibility = visibility
+        self.health_cost = health_cost
+        self.damage_multiplier = damage_multiplier
+        self.message = message
+
+    def apply(self, mage: "ArcaneChampion") -> None:
+        """Apply the tactic to a mage."""
+        mage.stealth.modify_visibility(self.visibility)
+        mage.health.reduce_health(self.health_cost)
+        mage.damage_multiplier = self.damage_multiplier
+        change = round((self.damage_multiplier - 1) * 100)
+        effect = "enhanced" if change >= 0 else "reduced"
+        print(
+            f"{self.message} "
+            f"Current visibility: {mage.stealth.visibility}, "
+            f"Health: {mage.health.health}. "
+            f"Damage {effect} by {abs(change)}%."
+        )
+
+
 class Sanctuary(NamedObject):
     """Class representing a sanctuary where mages can gather."""
 
@@ -110,7 +149,20 @@ class Sanctuary(NamedObject):
 
     def add_mage(self, mage: "Mage") -> None:
         """Add a mage to the sanctuary."""
-        self.mages.append(mage)
+        if mage not in self.mages:
+            self.mages.append(mage)
+        mage.sanctuary = self
+
+    def remove_mage(self, mage: "Mage") -> None:
+        """Remove a mage from the sanctuary."""
+        if mage in self.mages:
+            self.mages.remove(mage)
+        if mage.sanctuary is self:
+            mage.sanctuary = None
+
+    def danger(self) -> int:
+        """Return the total damage of the enemies left in the sanctuary."""
+        return sum(enemy.damage for enemy in self.enemies)
 
 
 class Mage(NamedObject):
@@ -153,11 +205,18 @@ class Enemy(NamedObject):
 class ArcaneChampion(Mage):
     """A specialized mage class with enhanced abilities & hunger management."""
 
-    def __init__(self, name: str, health: int):
-        """Initialize with a name and specific health."""
+    def __init__(
+        self,
+        name: str,
+        health: int,
+        tactics: Optional[List[StealthTactic]] = None,
+    ):
+        """Initialize with a name, specific health and stealth tactics."""
         super().__init__(name)
         self.health = HealthComponent(health)
         self.damage_multiplier = 1.0
+        self.tactics: List[StealthTactic] = tactics or []
+        self.stats: Optional[StatsStore] = None
 
     def attack(self, target: Enemy, weapon: SpellcasterBow) -> None:
         """Attempt to attack a target with a bow."""
@@ -172,6 +231,10 @@ class ArcaneChampion(Mage):
             damage = int(weapon.damage() * self.damage_multiplier)
             if damage > 0:
                 target.health.reduce_health(damage)
+                if self.stats:
+                    self.stats.record_attack(
+                        self.name, target.get_name(), damage
+                    )
                 print(
                     f"{target.get_name()} was hit for {damage} damage, "
                     f"{target.health.health} health remaining."
@@ -208,38 +271,12 @@ class ArcaneChampion(Mage):
             "You are too visible to attack stealthily. "
             "Choose a stealth tactic:"
         )
-        print("1. Move Behind a Rock")
-        print("2. Move Up to Hill")
-        print("3. Hide in Grass")
-        tactic = input("Choose a tactic (1-3): ")
-
-        if tactic == "1":
-            self.stealth.modify_visibility(-30)
-            self.health.reduce_health(5)
-            self.damage_multiplier = 1.5
-            print(
-                f"Moved behind a rock but almost hit by the enemy! "
-                f"Current visibility: {self.stealth.visibility}, "
-                f"Health: {self.health.health}. "
-                f"You've found a good attacking angle behind the rock! "
-                f"Damage enhanced by 50%."
-            )
-        elif tactic == "2":
-            self.stealth.modify_visibility(-40)
-            self.damage_multiplier = 0.85  # Reduce damage output by 15%
-            print(
-                f"Moved up to hill. "
-                f"Current visibility: {self.stealth.visibility}, "
-                f"Damage reduced by 15%."
-            )
-        elif tactic == "3":
-            self.stealth.modify_visibility(-15)
-            self.damage_multiplier = 1.05
-            print(
-                f"Hidden in grass. "
-                f"Current visibility: {self.stealth.visibility}, "
-                f"Damage enhanced by 5%."
-            )
+        for idx, option in enumerate(self.tactics):
+            print(f"{idx + 1}. {option.get_name()}")
+        tactic = input(f"Choose a tactic (1-{len(self.tactics)}): ")
+
+        if tactic.isdigit() and 0 < int(tactic) <= len(self.tactics):
+            self.tactics[int(tactic) - 1].apply(self)
         else:
             print("Invalid tactic. No changes made.")
 
@@ -258,11 +295,296 @@ def load_data_tsv(filename: str) -> List[Dict[str, Any]]:
         return []
 
 
+def load_stealth_tactics(filename: str) -> List[StealthTactic]:
+    """Load stealth tactics from a specified TSV file."""
+    return [
+        StealthTactic(
+            tactic["Name"],
+            int(tactic["Visibility"]),
+            int(tactic["HealthCost"]),
+            float(tactic["DamageMultiplier"]),
+            tactic["Message"],
+        )
+        for tactic in load_data_tsv(filename)
+    ]
+
+
+class FightOutcome:
+    """Final state of a simulated fight."""
+
+    def __init__(
+        self,
+        result: str,
+        rounds: int,
+        player_health: int,
+        enemy_health: int,
+        visibility: int,
+        damage_multiplier: float,
+        shots: int,
+        quiver_qty: int,
+    ):
+        """Initialize with the result and the final fight state."""
+        self.result = result
+        self.rounds = rounds
+        self.player_health = player_health
+        self.enemy_health = enemy_health
+        self.visibility = visibility
+        self.damage_multiplier = damage_multiplier
+        self.shots = shots
+        self.quiver_qty = quiver_qty
+
+
+def simulate_fight(
+    player_health: int,
+    min_dmg: int,
+    max_dmg: int,
+    enemy_health: int,
+    enemy_damage: int,
+    tactic: Optional[StealthTactic],
+    rng: random.Random,
+    visibility: int = 50,
+    damage_multiplier: float = 1.0,
+    shots: int = 8,
+    quiver_qty: int = 0,
+    max_rounds: int = 1000,
+    retreat_below: int = 0,
+) -> FightOutcome:
+    """Simulate a fight without printing, answering "yes" to every swing.
+
+    This follows the same rules as `Game.explore` and
+    `ArcaneChampion.attack`. When the player is too visible, `tactic` is
+    chosen, or no change is made if it is None. The player answers "no"
+    once their health is below `retreat_below`. The result is "win",
+    "loss", "retreat", or "stalemate" if `max_rounds` is reached.
+
+    Once the player is visible without a tactic, every remaining round is
+    an enemy hit, so the rest of the fight is computed in constant time.
+    Its result, rounds and health are exact, but the final visibility is
+    sampled from a different random stream than swing by swing.
+    """
+    rounds = 0
+    result = "stalemate"
+    while rounds < max_rounds:
+        if player_health < retreat_below:
+            result = "retreat"
+            break
+        if visibility >= 60 and tactic is None and enemy_damage > 0:
+            # The player can no longer attack or hide, so the enemy hits
+            # every round and the end of the fight can be computed.
+            hits = -(-player_health // enemy_damage)
+            result = "loss"
+            if retreat_below > 0:
+                until_retreat = (
+                    player_health - retreat_below
+                ) // enemy_damage + 1
+                if until_retreat < hits:
+                    hits, result = until_retreat, "retreat"
+            # A loss in the last round still counts, but the per-swing loop
+            # reaches max_rounds before it can retreat.
+            last = max_rounds - rounds
+            if hits > last or (result == "retreat" and hits == last):
+                hits, result = last, "stalemate"
+            rounds += hits
+            player_health = max(0, player_health - hits * enemy_damage)
+            # Each hit adds 5 to 15 visibility. Their sum is drawn at once
+            # from its normal approximation, with mean and variance 10 a hit.
+            spread = round(rng.gauss(0, math.sqrt(10 * hits)))
+            visibility += min(15 * hits, max(5 * hits, 10 * hits + spread))
+            break
+        rounds += 1
+        if visibility < 60:
+            damage = 0
+            if shots > 0:
+                shots -= 1
+                damage = int(rng.randint(min_dmg, max_dmg) * damage_multiplier)
+            if damage > 0:
+                enemy_health = max(0, enemy_health - damage)
+            else:
+                shots, quiver_qty = quiver_qty, 0
+        elif tactic is not None:
+            visibility = max(0, visibility + tactic.visibility)
+            player_health = max(0, player_health - tactic.health_cost)
+            damage_multiplier = tactic.damage_multiplier
+        visibility += rng.randint(5, 15)
+
+        if enemy_health <= 0:
+            result = "win"
+            break
+        if visibility >= 60:
+            player_health = max(0, player_health - enemy_damage)
+        if player_health <= 0:
+            result = "loss"
+            break
+    return FightOutcome(
+        result,
+        rounds,
+        player_health,
+        enemy_health,
+        visibility,
+        damage_multiplier,
+        shots,
+        quiver_qty,
+    )
+
+
+class RouteTree:
+    """Shortest paths from one sanctuary to every other."""
+
+    def __init__(
+        self,
+        cost: Dict[str, float],
+        distance: Dict[str, int],
+        previous: Dict[str, str],
+    ):
+        """Initialize with the cost, distance and previous hop of routes."""
+        self.cost = cost
+        self.distance = distance
+        self.previous = previous
+
+
+class WorldGraph:
+    """Graph of sanctuaries connected by travel routes.
+
+    Distance routes weigh each route by its distance. Safe routes also add
+    the danger of every sanctuary entered on the way, so they avoid
+    sanctuaries with enemies left. Routes from a sanctuary come from a
+    tree of shortest paths to every other sanctuary, built with Dijkstra's
+    algorithm in O(E log V) the first time a route from it is looked up.
+    With the tree cached, the cost and distance of the route to any
+    destination take constant time, and the route itself takes time
+    proportional to its length, so a travel menu listing every destination
+    costs one search. Each tree holds O(V) entries, and at most `max_trees`
+    of each kind are kept, evicting the least recently used, so memory and
+    the cost of `set_danger` stay bounded in large worlds.
+    """
+
+    def __init__(
+        self,
+        routes: List[Tuple[str, str, int]],
+        danger: Optional[Dict[str, int]] = None,
+        max_trees: int = 64,
+    ):
+        """Initialize with routes, danger levels and the cache size."""
+        self.neighbors: Dict[str, Dict[str, int]] = {}
+        for start, end, distance in routes:
+            self.neighbors.setdefault(start, {})[end] = distance
+            self.neighbors.setdefault(end, {})[start] = distance
+        self.danger: Dict[str, int] = {name: 0 for name in self.neighbors}
+        self.danger.update(danger or {})
+        for name in self.danger:
+            self.neighbors.setdefault(name, {})
+        self.max_trees = max_trees
+        self.distance_trees: OrderedDict[str, RouteTree] = OrderedDict()
+        self.safe_trees: OrderedDict[str, RouteTree] = OrderedDict()
+
+    def build_tree(self, start: str, safe: bool) -> RouteTree:
+        """Run Dijkstra's algorithm from a sanctuary."""
+        tree = RouteTree({start: 0}, {start: 0}, {})
+        self.relax(tree, [(0, start)], safe)
+        return tree
+
+    def relax(
+        self, tree: RouteTree, heap: List[Tuple[float, str]], safe: bool
+    ) -> None:
+        """Propagate cheaper routes from the sanctuaries on the heap."""
+        while heap:
+            current, name = heapq.heappop(heap)
+            if current > tree.cost[name]:
+                continue
+            for other, distance in self.neighbors[name].items():
+                candidate = current + distance
+                if safe:
+                    candidate += self.danger[other]
+                if candidate < tree.cost.get(other, math.inf):
+                    tree.cost[other] = candidate
+                    tree.distance[other] = tree.distance[name] + distance
+                    tree.previous[other] = name
+                    heapq.heappush(heap, (candidate, other))
+
+    def cached_tree(
+        self, trees: OrderedDict[str, RouteTree], start: str, safe: bool
+    ) -> RouteTree:
+        """Return a tree from a cache, building it and evicting if needed."""
+        tree = trees.get(start)
+        if tree is None:
+            tree = self.build_tree(start, safe)
+            trees[start] = tree
+            if len(trees) > self.max_trees:
+                trees.popitem(last=False)
+        else:
+            trees.move_to_end(start)
+        return tree
+
+    def distance_tree(self, start: str) -> RouteTree:
+        """Return the distance routes from a sanctuary."""
+        return self.cached_tree(self.distance_trees, start, safe=False)
+
+    def safe_tree(self, start: str) -> RouteTree:
+        """Return the danger-weighted routes from a sanctuary."""
+        return self.cached_tree(self.safe_trees, start, safe=True)
+
+    def tree(self, start: str, safe: bool) -> RouteTree:
+        """Return the distance or danger-weighted routes from a sanctuary."""
+        return self.safe_tree(start) if safe else self.distance_tree(start)
+
+    def cost(self, start: str, end: str, safe: bool = False) -> float:
+        """Return the cost of the best route, or infinity if unreachable."""
+        return self.tree(start, safe).cost.get(end, math.inf)
+
+    def route_distance(
+        self, start: str, end: str, safe: bool = False
+    ) -> float:
+        """Return the distance along the best route, or infinity."""
+        return self.tree(start, safe).distance.get(end, math.inf)
+
+    def route(self, start: str, end: str, safe: bool = False) -> List[str]:
+        """Return the sanctuaries on the best route, or [] if unreachable."""
+        tree = self.tree(start, safe)
+        if end not in tree.cost:
+            return []
+        path = [end]
+        while path[-1] != start:
+            path.append(tree.previous[path[-1]])
+        path.reverse()
+        return path
+
+    def distance(self, path: List[str]) -> int:
+        """Return the total distance along a route."""
+        return sum(
+            self.neighbors[start][end]
+            for start, end in zip(path, path[1:], strict=False)
+        )
+
+    def set_danger(self, name: str, danger: int) -> None:
+        """Change the danger of a sanctuary and update the safe routes.
+
+        Lower danger only makes routes entering the sanctuary cheaper, so
+        each cached tree is repaired by lowering its cost and propagating
+        the improvements, which touches only the sanctuaries whose cost
+        drops. Higher danger drops the cached safe routes, so the next
+        lookup from each sanctuary rebuilds its tree.
+        """
+        old = self.danger[name]
+        self.danger[name] = danger
+        if danger > old:
+            self.safe_trees.clear()
+            return
+        if danger == old:
+            return
+        for start, tree in self.safe_trees.items():
+            if name == start or name not in tree.cost:
+                continue
+            tree.cost[name] -= old - danger
+            self.relax(tree, [(tree.cost[name], name)], safe=True)
+
+
 class Game:
     """Play game."""
 
-    def __init__(self) -> None:
-        """Initialize game components and load data."""
+    def __init__(
+        self, stats: Optional[StatsStore] = None, player_name: str = "Hero"
+    ) -> None:
+        """Initialize game components, load data and record the game."""
         # Load data
         self.bows = {
             bow["Name"]: SpellcasterBow(
@@ -280,14 +602,25 @@ class Game:
             )
             for enemy in load_data_tsv("data/enemies.tsv")
         }
+        self.stealth_tactics = load_stealth_tactics("data/stealth_tactics.tsv")
         self.sanctuaries = self.initialize_sanctuaries()
+        self.world = self.initialize_world()
 
         # Randomly select a sanctuary to start the game
         self.current_sanctuary = random.choice(self.sanctuaries)
+        self.arrival_times = {
+            self.current_sanctuary.get_name(): time.monotonic()
+        }
 
         # Setup player
-        self.player = ArcaneChampion("Hero", 200)
+        self.player = ArcaneChampion(player_name, 200, self.stealth_tactics)
         self.enemies_defeated = False
+        self.rng = random.Random()
+        self.current_sanctuary.add_mage(self.player)
+        self.stats = stats
+        self.player.stats = stats
+        if self.stats:
+            self.stats.record_game(self.player.get_name())
 
     def initialize_sanctuaries(self) -> list[Sanctuary]:
         """Initialize sanctuaries from data file."""
@@ -298,12 +631,34 @@ class Game:
             quivers = [
                 self.quivers[name] for name in data["Quivers"].split(", ")
             ]
+            # Each sanctuary gets its own enemies so that defeating one
+            # does not defeat its namesakes elsewhere.
             enemies = [
-                self.enemies[name] for name in data["Enemies"].split(", ")
+                Enemy(
+                    name,
+                    self.enemies[name].health.health,
+                    self.enemies[name].damage,
+                )
+                for name in data["Enemies"].split(", ")
             ]
             sanctuaries.append(Sanctuary(data["Name"], bows, quivers, enemies))
         return sanctuaries
 
+    def initialize_world(self) -> WorldGraph:
+        """Initialize the travel routes between sanctuaries."""
+        routes = [
+            (route["From"], route["To"], int(route["Distance"]))
+            for route in load_data_tsv("data/sanctuary_routes.tsv")
+        ]
+        world = WorldGraph(
+            routes,
+            {
+                sanctuary.get_name(): sanctuary.danger()
+                for sanctuary in self.sanctuaries
+            },
+        )
+        return world
+
     def run(self) -> None:
         """Run the main game loop."""
         while True:
@@ -313,43 +668,61 @@ class Game:
             print("1. Explore (fight an enemy)")
             print("2. Check Inventory")
             print("3. Select Equipment (Should be done before fight)")
-            print("4. Exit Game")
-            choice = input("Choose an action (1-4): ")
+            print("4. Travel to another sanctuary")
+            print("5. Auto-resolve a fight")
+            print("6. Exit Game")
+            choice = input("Choose an action (1-6): ")
 
             if choice == "1":
                 self.explore()
-                if self.enemies_defeated:
-                    print(
-                        "Congratulations! You have defeated all the enemies!"
-                    )
-                    break
             elif choice == "2":
                 self.check_inventory()
             elif choice == "3":
                 self.select_equipment()
             elif choice == "4":
+                self.travel()
+            elif choice == "5":
+                self.choose_auto_resolve()
+            elif choice == "6":
                 print("Exiting game...")
                 sys.exit(0)
             else:
                 print("Invalid input, please choose a valid action.")
 
-    def explore(self) -> None:
-        """Handle exploration and combat."""
+            if self.enemies_defeated:
+                print("Congratulations! You have defeated all the enemies!")
+                break
+
+    def encounter(self) -> Optional[Enemy]:
+        """Pick an enemy of the current sanctuary to fight."""
+        if not self.current_sanctuary.enemies:
+            print(
+                "There are no enemies left here. Travel to another sanctuary."
+            )
+            return None
         enemy = random.choice(self.current_sanctuary.enemies)
         print(f"You encounter a {enemy.get_name()}!")
+        if self.stats:
+            self.stats.record_encounter(enemy.get_name())
+        return enemy
+
+    def explore(self) -> None:
+        """Handle exploration and combat."""
+        enemy = self.encounter()
+        if enemy is None:
+            return
+        weapon = next(
+            (
+                item
+                for item in self.player.inventory
+                if isinstance(item, SpellcasterBow)
+            ),
+            None,
+        )
+        prompt = f"Do you want to attack the {enemy.get_name()}? (yes/no): "
         while enemy.health.health > 0:
-            action = input(
-                f"Do you want to attack the {enemy.get_name()}? (yes/no): "
-            )
-            if action.lower() == "yes":
-                weapon = next(
-                    (
-                        item
-                        for item in self.player.inventory
-                        if isinstance(item, SpellcasterBow)
-                    ),
-                    None,
-                )
+            action = input(prompt).lower()
+            if action == "yes":
                 if weapon:
                     self.player.attack(enemy, weapon)
                     if enemy.health.health > 0:
@@ -358,14 +731,11 @@ class Game:
                             f"{enemy.health.health} health left."
                         )
                     else:
-                        print(f"You defeated the {enemy.get_name()}!")
-                        self.current_sanctuary.enemies.remove(enemy)
-                        if not self.current_sanctuary.enemies:
-                            self.enemies_defeated = True
+                        self.defeat_enemy(enemy)
                         break
                 else:
                     print("No weapon to attack with!")
-            elif action.lower() == "no":
+            elif action == "no":
                 print("You choose to avoid the fight.")
                 break
             else:
@@ -375,8 +745,195 @@ class Game:
                 enemy.attack(self.player)
 
             if self.player.health.health <= 0:
-                print("You have been defeated.")
-                sys.exit(0)
+                self.player_defeated(enemy)
+
+    def defeat_enemy(self, enemy: Enemy) -> None:
+        """Remove a defeated enemy from the current sanctuary."""
+        print(f"You defeated the {enemy.get_name()}!")
+        if self.stats:
+            self.stats.record_kill(self.player.get_name(), enemy.get_name())
+        self.current_sanctuary.enemies.remove(enemy)
+        self.world.set_danger(
+            self.current_sanctuary.get_name(),
+            self.current_sanctuary.danger(),
+        )
+        if not self.current_sanctuary.enemies:
+            self.clear_sanctuary()
+        self.enemies_defeated = all(
+            not sanctuary.enemies for sanctuary in self.sanctuaries
+        )
+
+    def player_defeated(self, enemy: Enemy) -> None:
+        """End the game after the player was defeated by an enemy."""
+        print("You have been defeated.")
+        if self.stats:
+            self.stats.record_defeat(self.player.get_name(), enemy.get_name())
+        sys.exit(0)
+
+    def choose_auto_resolve(self) -> None:
+        """Ask for an auto-resolve policy and resolve a fight with it."""
+        print("Choose a policy:")
+        print("1. Always attack")
+        print("2. Use a stealth tactic when too visible")
+        print("3. Retreat below a health threshold")
+        policy = input("Choose a policy (1-3): ")
+        tactic: Optional[StealthTactic] = None
+        retreat_below = 0
+        if policy in ("2", "3"):
+            tactics = self.player.tactics
+            print("0. No tactic")
+            for idx, option in enumerate(tactics):
+                print(f"{idx + 1}. {option.get_name()}")
+            choice = input(f"Choose a tactic (0-{len(tactics)}): ")
+            if choice.isdigit() and 0 < int(choice) <= len(tactics):
+                tactic = tactics[int(choice) - 1]
+            elif choice != "0":
+                print("Invalid tactic, please choose a valid number.")
+                return
+        if policy == "3":
+            try:
+                retreat_below = int(input("Retreat below health: "))
+            except ValueError:
+                print("Incompatible type, please enter a valid integer.")
+                return
+        elif policy not in ("1", "2"):
+            print("Invalid choice, please select a valid number.")
+            return
+        self.auto_resolve(tactic, retreat_below)
+
+    def auto_resolve(
+        self, tactic: Optional[StealthTactic] = None, retreat_below: int = 0
+    ) -> None:
+        """Fight an enemy to the end in one call and print a summary.
+
+        Every swing is answered "yes", `tactic` is used whenever the player
+        is too visible, and the player retreats once their health is below
+        `retreat_below`.
+        """
+        weapon = next(
+            (
+                item
+                for item in self.player.inventory
+                if isinstance(item, SpellcasterBow)
+            ),
+            None,
+        )
+        if weapon is None:
+            print("No weapon to attack with!")
+            return
+        enemy = self.encounter()
+        if enemy is None:
+            return
+        quiver = next(
+            (
+                item
+                for item in self.player.inventory
+                if isinstance(item, MysticQuiver)
+            ),
+            None,
+        )
+        arrows = weapon.shots + (quiver.qty if quiver else 0)
+        enemy_health = enemy.health.health
+
+        outcome = simulate_fight(
+            self.player.health.health,
+            weapon.min_dmg,
+            weapon.max_dmg,
+            enemy.health.health,
+            enemy.damage,
+            tactic,
+            self.rng,
+            visibility=self.player.stealth.visibility,
+            damage_multiplier=self.player.damage_multiplier,
+            shots=weapon.shots,
+            quiver_qty=quiver.qty if quiver else 0,
+            retreat_below=retreat_below,
+        )
+        self.player.health.health = outcome.player_health
+        self.player.stealth.visibility = outcome.visibility
+        self.player.damage_multiplier = outcome.damage_multiplier
+        weapon.shots = outcome.shots
+        if quiver:
+            quiver.qty = outcome.quiver_qty
+        enemy.health.health = outcome.enemy_health
+        arrows -= outcome.shots + outcome.quiver_qty
+        if self.stats and arrows:
+            self.stats.record_attack(
+                self.player.get_name(),
+                enemy.get_name(),
+                enemy_health - outcome.enemy_health,
+                arrows,
+            )
+
+        print(
+            f"Fight with the {enemy.get_name()} ended after "
+            f"{outcome.rounds} rounds: {outcome.result}. "
+            f"Your health: {outcome.player_health}, "
+            f"{enemy.get_name()} health: {outcome.enemy_health}, "
+            f"arrows used: {arrows}."
+        )
+        if outcome.result == "win":
+            self.defeat_enemy(enemy)
+        elif outcome.result == "loss":
+            self.player_defeated(enemy)
+
+    def clear_sanctuary(self) -> None:
+        """Announce and record that the current sanctuary was cleared."""
+        name = self.current_sanctuary.get_name()
+        print(f"{name} has been cleared!")
+        if self.stats:
+            self.stats.record_clear(
+                self.player.get_name(),
+                name,
+                time.monotonic() - self.arrival_times[name],
+            )
+
+    def travel(self) -> None:
+        """Travel to another sanctuary along the safest route."""
+        start = self.current_sanctuary.get_name()
+        destinations = []
+        distances = []
+        for sanctuary in self.sanctuaries:
+            if sanctuary is self.current_sanctuary:
+                continue
+            distance = self.world.route_distance(
+                start, sanctuary.get_name(), safe=True
+            )
+            if distance < math.inf:
+                destinations.append(sanctuary)
+                distances.append(distance)
+        if not destinations:
+            print("There is nowhere to travel from here.")
+            return
+
+        print("Select your destination:")
+        for idx, sanctuary in enumerate(destinations):
+            name = sanctuary.get_name()
+            status = (
+                f"{len(sanctuary.enemies)} enemies left"
+                if sanctuary.enemies
+                else "cleared"
+            )
+            print(
+                f"{idx + 1}. {name} "
+                f"(safest route distance: {distances[idx]:.0f}, {status})"
+            )
+        try:
+            choice = int(input("Enter the number for your choice: "))
+        except ValueError:
+            print("Incompatible type, please enter a valid integer.")
+            return
+        if not 0 < choice <= len(destinations):
+            print("Invalid choice, please select a valid number.")
+            return
+
+        destination = destinations[choice - 1]
+        route = self.world.route(start, destination.get_name(), safe=True)
+        print(f"You travel along the safest route: {' -> '.join(route)}.")
+        self.current_sanctuary.remove_mage(self.player)
+        self.current_sanctuary = destination
+        self.current_sanctuary.add_mage(self.player)
+        self.arrival_times.setdefault(destination.get_name(), time.monotonic())
 
     def check_inventory(self) -> None:
         """Display player's inventory."""
@@ -400,13 +957,10 @@ class Game:
                 bow_choice = int(input("Enter the number for your choice: "))
                 if 0 < bow_choice <= len(self.current_sanctuary.bows):
                     bow_choice -= 1  # Convert to zero-index
-                    self.player.inventory.append(
-                        self.current_sanctuary.bows[bow_choice]
-                    )
-                    print(
-                        f"You have selected the "
-                        f"{self.current_sanctuary.bows[bow_choice].get_name()}."
-                    )
+                    bow = self.current_sanctuary.bows[bow_choice]
+                    if bow not in self.player.inventory:
+                        self.player.inventory.append(bow)
+                    print(f"You have selected the {bow.get_name()}.")
                     break  # Exit the loop if choice is valid
                 else:
                     print("Invalid choice, please select a valid number.")
@@ -425,13 +979,10 @@ class Game:
                 )
                 if 0 < quiver_choice <= len(self.current_sanctuary.quivers):
                     quiver_choice -= 1  # Convert to zero-index
-                    self.player.inventory.append(
-                        self.current_sanctuary.quivers[quiver_choice]
-                    )
-                    print(
-                        f"You have selected the "
-                        f"{self.current_sanctuary.quivers[quiver_choice].get_name()}."
-                    )
+                    quiver = self.current_sanctuary.quivers[quiver_choice]
+                    if quiver not in self.player.inventory:
+                        self.player.inventory.append(quiver)
+                    print(f"You have selected the {quiver.get_name()}.")
                     break  # Exit the loop if choice is valid
                 else:
                     print("Invalid choice, please select a valid number.")
@@ -441,5 +992,10 @@ class Game:
 
 # Example of starting the game
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    name = input("Enter your name: ").strip() or "Hero"
+    stats = StatsStore("dystoria_stats.db")
+    try:
+        game = Game(stats, name)
+        game.run()
+    finally:
+        stats.close()
@@ -0,0 +1,276 @@
+"""Memory profiling of long game sessions for the Dytoria Game."""
+
+import argparse
+import builtins
+import contextlib
+import io
+import random
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional
+
+from Dystoria import (
+    ArcaneChampion,
+    Enemy,
+    Game,
+    MysticQuiver,
+    SpellcasterBow,
+    load_stealth_tactics,
+)
+
+ACTIONS = [
+    "equip",
+    "inventory",
+    "travel",
+    "explore",
+    "auto-attack",
+    "auto-tactic",
+    "auto-retreat",
+]
+
+# Stealth tactic and health threshold of the auto-resolve policies.
+AUTO_TACTIC = "Move Up to Hill"
+AUTO_RETREAT_BELOW = 100
+
+
+class NullOutput(io.StringIO):
+    """Text stream that discards everything written to it.
+
+    Unlike a file, it keeps no buffer, so it allocates nothing that
+    outlives a single action.
+    """
+
+    def write(self, text: str) -> int:
+        """Discard the text."""
+        return len(text)
+
+
+def scripted_answer(prompt: str = "") -> str:
+    """Answer a game prompt: attack, hide on the hill, pick option one."""
+    if "(yes/no)" in prompt:
+        return "yes"
+    if "tactic" in prompt:
+        return "2"
+    return "1"
+
+
+@contextlib.contextmanager
+def scripted_session() -> Iterator[None]:
+    """Answer prompts with `scripted_answer` and discard the output."""
+    real_input = builtins.input
+    builtins.input = scripted_answer  # type: ignore[assignment]
+    try:
+        with contextlib.redirect_stdout(NullOutput()):
+            yield
+    finally:
+        builtins.input = real_input
+
+
+class ActionProfile:
+    """Memory used by one type of action over a session."""
+
+    def __init__(self, name: str):
+        """Initialize with the action name."""
+        self.name = name
+        self.count = 0
+        self.retained = 0
+        self.peak = 0
+        self.halfway_count = 0
+        self.halfway_retained = 0
+
+    def record(self, retained: int, peak: int) -> None:
+        """Record the memory retained and the peak of one action."""
+        self.count += 1
+        self.retained += retained
+        self.peak = max(self.peak, peak)
+
+    def mark_halfway(self) -> None:
+        """Remember the totals halfway through the session."""
+        self.halfway_count = self.count
+        self.halfway_retained = self.retained
+
+    def growth(self) -> float:
+        """Return the bytes retained per action in the second half."""
+        count = self.count - self.halfway_count
+        if count == 0:
+            return 0.0
+        return (self.retained - self.halfway_retained) / count
+
+
+def replenish(game: Game, goblins: Dict[str, Enemy]) -> None:
+    """Keep the session going: reset the player and refill arrows and foes.
+
+    Cleared sanctuaries get back a goblin from `goblins`, which are reused
+    so that refilling allocates nothing for the actions to be charged with.
+    """
+    game.player.health.health = 200
+    game.player.stealth.visibility = 50
+    for item in game.player.inventory:
+        if isinstance(item, SpellcasterBow):
+            item.shots = 8
+        elif isinstance(item, MysticQuiver):
+            item.qty = 30
+    sanctuary = game.current_sanctuary
+    if not sanctuary.enemies:
+        goblin = goblins[sanctuary.get_name()]
+        goblin.health.health = 50
+        sanctuary.enemies.append(goblin)
+    game.enemies_defeated = False
+
+
+def run_session(
+    actions: int = 100_000, seed: int = 0
+) -> Dict[str, ActionProfile]:
+    """Play a scripted session and profile the memory of each action type.
+
+    Each action is measured with tracemalloc: the memory still allocated
+    after it is retained, and the highest memory during it, above the
+    memory before it, is its peak. What `replenish` allocates is charged
+    to the action before it, which used up what was refilled.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    script = ["equip"] + [rng.choice(ACTIONS) for _ in range(actions - 1)]
+    game = Game()
+    game.rng = random.Random(seed)
+    tactic = next(
+        (
+            option
+            for option in game.player.tactics
+            if option.get_name() == AUTO_TACTIC
+        ),
+        None,
+    )
+    handlers: Dict[str, Callable[[], None]] = {
+        "equip": game.select_equipment,
+        "inventory": game.check_inventory,
+        "travel": game.travel,
+        "explore": game.explore,
+        "auto-attack": game.auto_resolve,
+        "auto-tactic": lambda: game.auto_resolve(tactic),
+        "auto-retreat": lambda: game.auto_resolve(None, AUTO_RETREAT_BELOW),
+    }
+    profiles = {name: ActionProfile(name) for name in ACTIONS}
+    goblins = {
+        sanctuary.get_name(): Enemy("Goblin", 50, 10)
+        for sanctuary in game.sanctuaries
+    }
+
+    with scripted_session():
+        tracemalloc.start()
+        try:
+            previous: Optional[str] = None
+            for idx, name in enumerate(script):
+                if idx == len(script) // 2:
+                    for profile in profiles.values():
+                        profile.mark_halfway()
+                before = tracemalloc.get_traced_memory()[0]
+                replenish(game, goblins)
+                if previous:
+                    profiles[previous].retained += (
+                        tracemalloc.get_traced_memory()[0] - before
+                    )
+                previous = name
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                with contextlib.suppress(SystemExit):
+                    handlers[name]()
+                current, peak = tracemalloc.get_traced_memory()
+                profiles[name].record(current - before, peak - before)
+        finally:
+            tracemalloc.stop()
+    return profiles
+
+
+def profile_swings(swings: int = 10_000) -> Dict[str, float]:
+    """Measure the peak memory per swing of the combat loop.
+
+    Each swing is one `ArcaneChampion.attack` followed by the enemy's
+    attack when the player is visible, as in `Game.explore`. The peak is
+    the highest memory during a swing above the memory before it. This is
+    not the number or size of the allocations: tracemalloc only sees the
+    blocks alive at a time, so memory freed within the swing and reused is
+    counted once, and the peak is a lower bound on the bytes allocated.
+    """
+    player = ArcaneChampion(
+        "Hero", 10**9, load_stealth_tactics("data/stealth_tactics.tsv")
+    )
+    enemy = Enemy("Training Dummy", 10**9, 1)
+    bow = SpellcasterBow("Test Bow", 20, 40)
+    quiver = MysticQuiver("Test Quiver", 0)
+    player.inventory.extend([bow, quiver])
+    total_peak = max_peak = 0
+
+    with scripted_session():
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            for _ in range(swings):
+                bow.shots = 8
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                player.attack(enemy, bow)
+                if player.stealth.visibility >= 60:
+                    enemy.attack(player)
+                peak = tracemalloc.get_traced_memory()[1] - before
+                total_peak += peak
+                max_peak = max(max_peak, peak)
+            retained = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+    return {
+        "mean_peak": total_peak / swings,
+        "max_peak": max_peak,
+        "retained": retained / swings,
+    }
+
+
+def check_growth(
+    profiles: Dict[str, ActionProfile], tolerance: float = 1.0
+) -> List[str]:
+    """Return the action types that keep growing by over `tolerance` bytes."""
+    return [
+        name
+        for name, profile in profiles.items()
+        if profile.growth() > tolerance
+    ]
+
+
+def format_report(
+    profiles: Dict[str, ActionProfile], swings: Dict[str, float]
+) -> str:
+    """Format the memory profile of a session."""
+    lines = [
+        f"{'action':<12} {'count':>8} {'retained B':>11} "
+        f"{'growth B/act':>13} {'peak B':>9}"
+    ]
+    for profile in profiles.values():
+        lines.append(
+            f"{profile.name:<12} {profile.count:>8} {profile.retained:>11} "
+            f"{profile.growth():>13.2f} {profile.peak:>9}"
+        )
+    lines.append(
+        f"Combat loop: {swings['mean_peak']:.0f} peak bytes per swing on "
+        f"average, {swings['max_peak']} peak bytes at most, "
+        f"{swings['retained']:.2f} B retained per swing."
+    )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Profile a session from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--actions", type=int, default=100_000)
+    parser.add_argument("--swings", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    profiles = run_session(args.actions, args.seed)
+    print(format_report(profiles, profile_swings(args.swings)))
+    growing = check_growth(profiles, args.tolerance)
+    if growing:
+        raise SystemExit(f"Unbounded memory growth: {', '.join(growing)}")
+
+
+if __name__ == "__main__":
+    main()
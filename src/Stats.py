@@ -0,0 +1,286 @@
+"""Persistent player statistics for the Dytoria Game."""
+
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_stats (
+    player TEXT PRIMARY KEY,
+    games INTEGER NOT NULL DEFAULT 0,
+    defeats INTEGER NOT NULL DEFAULT 0,
+    enemies_killed INTEGER NOT NULL DEFAULT 0,
+    arrows_used INTEGER NOT NULL DEFAULT 0,
+    damage_dealt INTEGER NOT NULL DEFAULT 0,
+    sanctuaries_cleared INTEGER NOT NULL DEFAULT 0,
+    best_clear_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS player_enemies_killed
+    ON player_stats (enemies_killed DESC);
+CREATE INDEX IF NOT EXISTS player_damage_dealt
+    ON player_stats (damage_dealt DESC);
+CREATE INDEX IF NOT EXISTS player_sanctuaries_cleared
+    ON player_stats (sanctuaries_cleared DESC);
+CREATE INDEX IF NOT EXISTS player_best_clear_seconds
+    ON player_stats (best_clear_seconds);
+
+CREATE TABLE IF NOT EXISTS enemy_stats (
+    enemy TEXT PRIMARY KEY,
+    encounters INTEGER NOT NULL DEFAULT 0,
+    kills INTEGER NOT NULL DEFAULT 0,
+    player_defeats INTEGER NOT NULL DEFAULT 0,
+    damage_taken INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS sanctuary_stats (
+    sanctuary TEXT PRIMARY KEY,
+    clears INTEGER NOT NULL DEFAULT 0,
+    total_clear_seconds REAL NOT NULL DEFAULT 0,
+    best_clear_seconds REAL
+);
+
+CREATE TABLE IF NOT EXISTS clears (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    sanctuary TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clears_sanctuary_seconds
+    ON clears (sanctuary, seconds);
+"""
+
+# Player statistics that have an index and can rank a leaderboard, with
+# the order in which they are ranked.
+LEADERBOARD_STATS = {
+    "enemies_killed": "DESC",
+    "damage_dealt": "DESC",
+    "sanctuaries_cleared": "DESC",
+    "best_clear_seconds": "ASC",
+}
+
+Write = Tuple[str, Tuple[Any, ...]]
+
+
+class StatsStore:
+    """Statistics stored in a local SQLite database.
+
+    Writes are queued and committed by a background thread, which groups
+    every write waiting in the queue into one transaction, so recording a
+    statistic never waits for the disk. If a transaction fails, its writes
+    are retried one by one so that only the failing write is lost. Queries
+    see the committed writes; call `flush` first to wait for the queued
+    ones.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500):
+        """Initialize with the database path and maximum batch size."""
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.writes: "queue.Queue[Optional[Write]]" = queue.Queue()
+        self.writer = threading.Thread(target=self.write_batches, daemon=True)
+        self.writer.start()
+
+    def write_batches(self) -> None:
+        """Commit queued writes in batches until the store is closed."""
+        while True:
+            batch = [self.writes.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.writes.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [write for write in batch if write is not None]
+            try:
+                self.commit(writes)
+            finally:
+                for _ in batch:
+                    self.writes.task_done()
+            if len(writes) < len(batch):
+                return
+
+    def commit(self, writes: List[Write]) -> None:
+        """Commit writes in one transaction, or one by one if it fails.
+
+        A write that fails on its own is reported and dropped, and the
+        others are still committed.
+        """
+        with self.lock:
+            try:
+                with self.connection:
+                    for sql, params in writes:
+                        self.connection.execute(sql, params)
+                return
+            except Exception:
+                pass
+            for sql, params in writes:
+                try:
+                    with self.connection:
+                        self.connection.execute(sql, params)
+                except Exception as e:
+                    print(f"Could not save statistics: {e}")
+
+    def queue_write(self, sql: str, *params: Any) -> None:
+        """Queue a write to be committed by the background thread."""
+        if not self.writer.is_alive():
+            print("Statistics store is closed, statistics not saved.")
+            return
+        self.writes.put((sql, params))
+
+    def flush(self) -> None:
+        """Wait until every queued write has been committed."""
+        if not self.writer.is_alive():
+            if not self.writes.empty():
+                print("Statistics store is closed, queued writes are lost.")
+            return
+        self.writes.join()
+
+    def close(self) -> None:
+        """Commit the queued writes and close the database."""
+        if self.writer.is_alive():
+            self.writes.put(None)
+            self.writer.join()
+        self.connection.close()
+
+    def upsert(self, table: str, key: str, name: str, **counts: Any) -> None:
+        """Queue adding counts to a row, creating it if needed."""
+        columns = ", ".join(counts)
+        placeholders = ", ".join("?" for _ in counts)
+        updates = ", ".join(
+            f"{column} = {column} + excluded.{column}" for column in counts
+        )
+        self.queue_write(
+            f"INSERT INTO {table} ({key}, {columns}) "
+            f"VALUES (?, {placeholders}) "
+            f"ON CONFLICT({key}) DO UPDATE SET {updates}",
+            name,
+            *counts.values(),
+        )
+
+    def record_game(self, player: str) -> None:
+        """Record that a player started a game."""
+        self.upsert("player_stats", "player", player, games=1)
+
+    def record_encounter(self, enemy: str) -> None:
+        """Record an encounter with an enemy."""
+        self.upsert("enemy_stats", "enemy", enemy, encounters=1)
+
+    def record_attack(
+        self, player: str, enemy: str, damage: int, arrows: int = 1
+    ) -> None:
+        """Record arrows shot at an enemy and the damage they dealt."""
+        self.upsert(
+            "player_stats",
+            "player",
+            player,
+            arrows_used=arrows,
+            damage_dealt=damage,
+        )
+        self.upsert("enemy_stats", "enemy", enemy, damage_taken=damage)
+
+    def record_kill(self, player: str, enemy: str) -> None:
+        """Record that a player killed an enemy."""
+        self.upsert("player_stats", "player", player, enemies_killed=1)
+        self.upsert("enemy_stats", "enemy", enemy, kills=1)
+
+    def record_defeat(self, player: str, enemy: str) -> None:
+        """Record that an enemy defeated a player."""
+        self.upsert("player_stats", "player", player, defeats=1)
+        self.upsert("enemy_stats", "enemy", enemy, player_defeats=1)
+
+    def record_clear(
+        self, player: str, sanctuary: str, seconds: float
+    ) -> None:
+        """Record the time a player took to clear a sanctuary."""
+        self.queue_write(
+            "INSERT INTO clears (player, sanctuary, seconds) VALUES (?, ?, ?)",
+            player,
+            sanctuary,
+            seconds,
+        )
+        self.queue_write(
+            "INSERT INTO player_stats (player, sanctuaries_cleared, "
+            "best_clear_seconds) VALUES (?, 1, ?) "
+            "ON CONFLICT(player) DO UPDATE SET "
+            "sanctuaries_cleared = sanctuaries_cleared + 1, "
+            "best_clear_seconds = "
+            "min(coalesce(best_clear_seconds, excluded.best_clear_seconds), "
+            "excluded.best_clear_seconds)",
+            player,
+            seconds,
+        )
+        self.queue_write(
+            "INSERT INTO sanctuary_stats (sanctuary, clears, "
+            "total_clear_seconds, best_clear_seconds) VALUES (?, 1, ?, ?) "
+            "ON CONFLICT(sanctuary) DO UPDATE SET "
+            "clears = clears + 1, "
+            "total_clear_seconds = total_clear_seconds + "
+            "excluded.total_clear_seconds, "
+            "best_clear_seconds = "
+            "min(coalesce(best_clear_seconds, excluded.best_clear_seconds), "
+            "excluded.best_clear_seconds)",
+            sanctuary,
+            seconds,
+            seconds,
+        )
+
+    def query(self, sql: str, *params: Any) -> List[Tuple[Any, ...]]:
+        """Run a read-only query against the committed statistics."""
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def leaderboard(
+        self, stat: str = "enemies_killed", limit: int = 10
+    ) -> List[Tuple[str, Any]]:
+        """Return the best players for an indexed statistic."""
+        if stat not in LEADERBOARD_STATS:
+            raise ValueError(f"No leaderboard for {stat}")
+        rows = self.query(
+            f"SELECT player, {stat} FROM player_stats "
+            f"WHERE {stat} IS NOT NULL "
+            f"ORDER BY {stat} {LEADERBOARD_STATS[stat]} LIMIT ?",
+            limit,
+        )
+        return [(player, value) for player, value in rows]
+
+    def fastest_clears(
+        self, sanctuary: str, limit: int = 10
+    ) -> List[Tuple[str, float]]:
+        """Return the fastest clears of a sanctuary."""
+        rows = self.query(
+            "SELECT player, seconds FROM clears WHERE sanctuary = ? "
+            "ORDER BY seconds LIMIT ?",
+            sanctuary,
+            limit,
+        )
+        return [(player, seconds) for player, seconds in rows]
+
+    def stats(self, table: str, key: str, name: str) -> Dict[str, Any]:
+        """Return the row of a player, enemy or sanctuary statistics table."""
+        if (table, key) not in (
+            ("player_stats", "player"),
+            ("enemy_stats", "enemy"),
+            ("sanctuary_stats", "sanctuary"),
+        ):
+            raise ValueError(f"Unknown statistics table: {table}")
+        with self.lock:
+            cursor = self.connection.execute(
+                f"SELECT * FROM {table} WHERE {key} = ?", (name,)
+            )
+            row = cursor.fetchone()
+            columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, row, strict=True)) if row else {}
+
+    def player_stats(self, player: str) -> Dict[str, Any]:
+        """Return the statistics of a player."""
+        return self.stats("player_stats", "player", player)
+
+    def enemy_stats(self, enemy: str) -> Dict[str, Any]:
+        """Return the statistics of an enemy."""
+        return self.stats("enemy_stats", "enemy", enemy)
+
+    def sanctuary_stats(self, sanctuary: str) -> Dict[str, Any]:
+        """Return the statistics of a sanctuary."""
+        return self.stats("sanctuary_stats", "sanctuary", sanctuary)
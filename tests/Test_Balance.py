@@ -0,0 +1,105 @@
+"""Tests for the balance-tuning sweep."""
+
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+import Balance
+from Balance import (
+    ResultCache,
+    apply_overrides,
+    format_report,
+    grid_candidates,
+    load_base_config,
+    main,
+    random_candidates,
+    run_sweep,
+)
+
+
+def test_apply_overrides() -> None:
+    """Test overriding parameters of the data files."""
+    base = load_base_config()
+    config = apply_overrides(
+        base,
+        {
+            "enemy.Dragon.Health": "250",
+            "tactic.Hide in Grass.DamageMultiplier": "1.2",
+        },
+    )
+    assert config["enemy"]["Dragon"]["Health"] == 250, "Override not applied"
+    assert config["tactic"]["Hide in Grass"]["DamageMultiplier"] == 1.2
+    assert base["enemy"]["Dragon"]["Health"] == 200, "Base was modified"
+
+
+def test_candidates() -> None:
+    """Test building grid and random search candidates."""
+    grid = grid_candidates(
+        {"enemy.Dragon.Health": [150, 200], "bow.Fire Bow.MaxDmg": [40, 45]}
+    )
+    assert len(grid) == 4, "Grid should contain every combination"
+    samples = random_candidates({"enemy.Troll.Damage": (10, 30)}, 5)
+    assert len(samples) == 5, "Wrong number of samples"
+    assert all(10 <= s["enemy.Troll.Damage"] <= 30 for s in samples)
+
+
+def test_run_sweep_uses_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a repeated sweep reuses cached results."""
+    cache = ResultCache(str(tmp_path))
+    candidates = grid_candidates({"enemy.Dragon.Health": [150, 400]})
+    targets = {"Dragon": 0.9}
+    report = run_sweep(candidates, targets, trials=20, workers=1, cache=cache)
+    assert report[0]["overrides"] == {"enemy.Dragon.Health": 150}
+    assert report[0]["score"] <= report[1]["score"], "Report not ranked"
+
+    files = sorted(str(path) for path in tmp_path.rglob("*.json"))
+    assert files, "Results should have been cached"
+
+    def no_simulation(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("Cached matchups should not be simulated")
+
+    monkeypatch.setattr(Balance, "ProcessPoolExecutor", no_simulation)
+    again = run_sweep(candidates, targets, trials=20, workers=1, cache=cache)
+    assert again == report, "Cached sweep should give the same report"
+    assert sorted(str(p) for p in tmp_path.rglob("*.json")) == files
+
+
+def test_run_sweep_skips_invalid_candidates(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that invalid candidates are ranked last and never simulated."""
+    with pytest.raises(ValueError):
+        apply_overrides(load_base_config(), {"bow.Fire Bow.MinDmg": 99})
+
+    def no_simulation(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("Invalid candidates should not be simulated")
+
+    monkeypatch.setattr(Balance, "ProcessPoolExecutor", no_simulation)
+    candidates = [{"bow.Fire Bow.MinDmg": 34, "bow.Fire Bow.MaxDmg": 28}]
+    report = run_sweep(candidates, {"Dragon": 0.5}, trials=20, workers=1)
+    assert report[0]["error"] == "Fire Bow MinDmg 34 is above MaxDmg 28"
+    assert "invalid" in format_report(report), "Reason should be reported"
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--range", "bow.Fire Bow.MaxDmg=30"],
+        ["--range", "bow.Fire Bow.MaxDmg=40:30"],
+        ["--grid", "enemy.Dragon.Health=abc"],
+        ["--grid", "enemy.Dragon.Speed=10"],
+        ["--grid", "enemy.Hydra.Health=10"],
+        ["--target", "Dragon=high"],
+    ],
+)
+def test_main_rejects_bad_arguments(
+    argv: List[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that bad parameters are reported as usage errors."""
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 2, "Bad arguments should be a usage error"
+    assert "error:" in capsys.readouterr().err, "Error should be explained"
@@ -1,7 +1,14 @@
 """Tests."""
 
+import random
+from typing import Any, Dict
+
+import pytest
+
 from Dystoria import (
+    ArcaneChampion,
     Enemy,
+    Game,
     HealthComponent,
     Mage,
     MysticQuiver,
@@ -9,7 +16,11 @@ from Dystoria import (
     Sanctuary,
     SpellcasterBow,
     StealthComponent,
+    StealthTactic,
+    WorldGraph,
     load_data_tsv,
+    load_stealth_tactics,
+    simulate_fight,
 )
 
 
@@ -103,3 +114,193 @@ def test_sanctuary_with_data_file() -> None:
     mage = Mage("Test Mage")
     sanctuary.add_mage(mage)
     assert mage in sanctuary.mages, "Mage not added to sanctuary correctly"
+
+
+def test_stealth_tactics_from_data_file() -> None:
+    """Test loading and applying stealth tactics from a data file."""
+    tactics = load_stealth_tactics("data/stealth_tactics.tsv")
+    assert len(tactics) == 3, "Stealth tactics not loaded correctly"
+    rock = tactics[0]
+    assert rock.get_name() == "Move Behind a Rock", "Tactic name incorrect"
+    champion = ArcaneChampion("Test Champion", 200, tactics)
+    champion.stealth.visibility = 70
+    rock.apply(champion)
+    assert champion.stealth.visibility == 40, "Visibility not reduced"
+    assert champion.health.health == 195, "Health cost not applied"
+    assert champion.damage_multiplier == 1.5, "Multiplier not applied"
+
+
+def test_simulate_fight() -> None:
+    """Test the quiet fight simulation."""
+    tactic = StealthTactic("Vanish", -100, 0, 1.0)
+    outcome = simulate_fight(200, 20, 20, 100, 10, tactic, random.Random(0))
+    assert outcome.result == "win", "Fight should be won"
+    assert outcome.enemy_health == 0, "Enemy should be defeated"
+    assert outcome.shots == 3, "Five arrows should have been used"
+
+    outcome = simulate_fight(50, 20, 20, 100, 10, None, random.Random(0))
+    assert outcome.result == "loss", "Fight without tactic should be lost"
+    assert outcome.player_health == 0, "Player should be defeated"
+
+
+def test_world_graph_routes() -> None:
+    """Test distance and danger-weighted routes between sanctuaries."""
+    world = WorldGraph(
+        [("A", "B", 1), ("B", "C", 1), ("A", "C", 5)],
+        {"A": 0, "B": 10, "C": 0},
+    )
+    assert world.route("A", "C") == ["A", "B", "C"], "Shortest route wrong"
+    assert world.cost("A", "C") == 2, "Shortest distance wrong"
+    assert world.route("A", "C", safe=True) == ["A", "C"], "Safe route wrong"
+    assert world.distance(["A", "C"]) == 5, "Route distance wrong"
+    world.set_danger("B", 0)
+    assert world.route("A", "C", safe=True) == ["A", "B", "C"]
+    assert world.cost("C", "A", safe=True) == 2, "Safe cost not updated"
+
+
+def test_world_graph_incremental_update() -> None:
+    """Test that clearing sanctuaries matches recomputing the routes."""
+    rng = random.Random(0)
+    names = [f"S{i}" for i in range(60)]
+    routes = [
+        (names[i], names[rng.randrange(i)], rng.randint(1, 9))
+        for i in range(1, len(names))
+    ]
+    routes += [
+        (rng.choice(names), rng.choice(names), rng.randint(1, 9))
+        for _ in range(60)
+    ]
+    danger = {name: rng.randint(0, 50) for name in names}
+    world = WorldGraph(routes, danger, max_trees=len(names))
+    for name in names:
+        world.safe_tree(name)
+    for name in rng.sample(names, 20):
+        world.set_danger(name, 0)
+        danger[name] = 0
+    fresh = WorldGraph(routes, danger)
+    for start in names:
+        for end in names:
+            assert world.cost(start, end, safe=True) == fresh.cost(
+                start, end, safe=True
+            ), "Incremental update differs from recomputing"
+
+
+def test_simulate_fight_retreat() -> None:
+    """Test retreating and the computed end of a fight without tactics."""
+    outcome = simulate_fight(
+        100, 20, 20, 500, 10, None, random.Random(0), visibility=60
+    )
+    assert outcome.result == "loss", "Exposed player should lose"
+    assert outcome.rounds == 10, "Player should survive ten hits"
+
+    outcome = simulate_fight(
+        100,
+        20,
+        20,
+        500,
+        10,
+        None,
+        random.Random(0),
+        visibility=60,
+        retreat_below=35,
+    )
+    assert outcome.result == "retreat", "Player should retreat"
+    assert outcome.player_health == 30, "Player should retreat below 35"
+    assert outcome.rounds == 7, "Player should retreat after seven hits"
+
+
+def test_auto_resolve() -> None:
+    """Test resolving a fight in one call."""
+    game = Game()
+    bow = SpellcasterBow("Test Bow", 50, 50)
+    quiver = MysticQuiver("Test Quiver", 10)
+    game.player.inventory.extend([bow, quiver])
+    game.current_sanctuary.enemies = [Enemy("Test Enemy", 100, 1)]
+    game.auto_resolve(StealthTactic("Vanish", -100, 0, 1.0))
+    assert not game.current_sanctuary.enemies, "Enemy should be defeated"
+    assert bow.shots == 6, "Two arrows should have been used"
+    assert quiver.qty == 10, "Quiver should not have been used"
+
+
+def test_world_graph_cache_is_bounded() -> None:
+    """Test that only the most recently used route trees are kept."""
+    routes = [(f"S{i}", f"S{i + 1}", 1) for i in range(10)]
+    world = WorldGraph(routes, max_trees=3)
+    for i in range(10):
+        assert world.cost(f"S{i}", "S0") == i, "Distance wrong"
+    assert list(world.distance_trees) == ["S7", "S8", "S9"]
+
+
+def test_travel_menu_uses_one_route_tree(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that listing more destinations than cached trees is one search."""
+    names = [f"S{i}" for i in range(200)]
+    game = Game()
+    game.sanctuaries = [Sanctuary(name, [], [], []) for name in names]
+    game.world = WorldGraph(
+        [(names[i], names[i + 1], 1) for i in range(len(names) - 1)],
+        {name: 0 for name in names},
+    )
+    game.current_sanctuary = game.sanctuaries[0]
+    builds = []
+    build_tree = game.world.build_tree
+
+    def counted_build_tree(start: str, safe: bool) -> Any:
+        builds.append(start)
+        return build_tree(start, safe)
+
+    monkeypatch.setattr(game.world, "build_tree", counted_build_tree)
+    answers = iter(["0", "0", "199"])
+    monkeypatch.setattr("builtins.input", lambda _="": next(answers))
+    game.travel()
+    game.travel()
+    assert builds == ["S0"], "Menus should share one route tree"
+    game.travel()
+    assert game.current_sanctuary.get_name() == "S199", "Travel failed"
+
+
+def test_simulate_fight_shortcut_matches_swings() -> None:
+    """Test the computed end of a fight against simulating every swing."""
+    rng = random.Random(0)
+    for seed in range(500):
+        player_health = rng.randint(1, 300)
+        multiplier = rng.choice([0.85, 1.0, 1.5])
+        args = (
+            player_health,
+            rng.randint(1, 20),
+            rng.randint(20, 50),
+            rng.randint(10, 300),
+            rng.randint(1, 40),
+        )
+        kwargs: Dict[str, Any] = {
+            "visibility": rng.randint(0, 90),
+            "damage_multiplier": multiplier,
+            "shots": rng.randint(0, 8),
+            "quiver_qty": rng.randint(0, 20),
+            "max_rounds": rng.randint(1, 40),
+            "retreat_below": rng.choice([0, rng.randint(1, player_health)]),
+        }
+        # A tactic that changes nothing behaves like no tactic, but keeps
+        # the fight on the per-swing path.
+        still = StealthTactic("Stand Still", 0, 0, multiplier)
+        shortcut = simulate_fight(*args, None, random.Random(seed), **kwargs)
+        swings = simulate_fight(*args, still, random.Random(seed), **kwargs)
+        visible = swings.visibility >= 60
+        assert (shortcut.visibility >= 60) == visible, f"Seed {seed}"
+        shortcut.visibility = swings.visibility
+        assert vars(shortcut) == vars(swings), f"Mismatch for seed {seed}"
+
+    outcome = simulate_fight(
+        100,
+        20,
+        20,
+        500,
+        10,
+        None,
+        random.Random(0),
+        visibility=60,
+        retreat_below=35,
+        max_rounds=7,
+    )
+    assert outcome.result == "stalemate", "Retreat came after max_rounds"
@@ -0,0 +1,41 @@
+"""Tests for memory use over long sessions."""
+
+from Dystoria import Game
+from Memory import (
+    ACTIONS,
+    check_growth,
+    profile_swings,
+    run_session,
+    scripted_session,
+)
+
+
+def test_repeated_actions_stay_bounded() -> None:
+    """Test that repeating actions does not grow the game state."""
+    game = Game()
+    with scripted_session():
+        for _ in range(50):
+            game.select_equipment()
+            game.travel()
+    assert len(game.player.inventory) <= len(game.bows) + len(
+        game.quivers
+    ), "Inventory should not grow"
+    assert all(
+        len(sanctuary.mages) <= 1 for sanctuary in game.sanctuaries
+    ), "Sanctuaries should only hold the player"
+    assert game.player in game.current_sanctuary.mages
+
+
+def test_session_memory_is_bounded() -> None:
+    """Test that no action type keeps retaining memory in a session."""
+    profiles = run_session(5000)
+    assert sum(profile.count for profile in profiles.values()) == 5000
+    assert all(profiles[name].count for name in ACTIONS), "Action not run"
+    assert check_growth(profiles) == [], "Memory grows without bound"
+
+
+def test_combat_loop_retains_nothing() -> None:
+    """Test that swings in the combat loop do not retain memory."""
+    swings = profile_swings(2000)
+    assert swings["retained"] < 1, "Swings should not retain memory"
+    assert swings["mean_peak"] > 0, "Swings should be measured"
@@ -0,0 +1,87 @@
+"""Tests for the player statistics store."""
+
+from pathlib import Path
+
+import pytest
+
+from Dystoria import Game
+from Stats import StatsStore
+
+
+def test_record_and_query(tmp_path: Path) -> None:
+    """Test that queued statistics are committed and can be queried."""
+    stats = StatsStore(str(tmp_path / "stats.db"))
+    stats.record_game("Hero")
+    stats.record_encounter("Goblin")
+    for damage in (20, 30):
+        stats.record_attack("Hero", "Goblin", damage)
+    stats.record_kill("Hero", "Goblin")
+    stats.record_clear("Hero", "Mystic Forest", 12.5)
+    stats.record_clear("Hero", "Mystic Forest", 10.0)
+    stats.record_defeat("Hero", "Troll")
+    stats.flush()
+
+    player = stats.player_stats("Hero")
+    assert player["games"] == 1, "Games not recorded"
+    assert player["arrows_used"] == 2, "Arrows not recorded"
+    assert player["damage_dealt"] == 50, "Damage not recorded"
+    assert player["enemies_killed"] == 1, "Kills not recorded"
+    assert player["defeats"] == 1, "Defeats not recorded"
+    assert player["best_clear_seconds"] == 10.0, "Best clear not recorded"
+    assert stats.enemy_stats("Goblin")["damage_taken"] == 50
+    assert stats.sanctuary_stats("Mystic Forest")["clears"] == 2
+    assert stats.fastest_clears("Mystic Forest")[0] == ("Hero", 10.0)
+    stats.close()
+
+
+def test_leaderboard_persists(tmp_path: Path) -> None:
+    """Test the leaderboard across sessions of the same database."""
+    path = str(tmp_path / "stats.db")
+    stats = StatsStore(path, batch_size=7)
+    for idx in range(100):
+        for _ in range(idx % 10):
+            stats.record_kill(f"Player {idx}", "Troll")
+    stats.close()
+
+    stats = StatsStore(path)
+    top = stats.leaderboard("enemies_killed", limit=3)
+    assert [kills for _, kills in top] == [9, 9, 9], "Leaderboard not ranked"
+    assert stats.enemy_stats("Troll")["kills"] == 450, "Writes were lost"
+    with pytest.raises(ValueError):
+        stats.leaderboard("games")
+    stats.close()
+
+
+def test_writes_after_close(tmp_path: Path) -> None:
+    """Test that a closed store neither hangs nor saves new writes."""
+    stats = StatsStore(str(tmp_path / "stats.db"))
+    stats.close()
+    stats.record_game("Hero")
+    stats.flush()
+    assert stats.writes.empty(), "Writes after close should be dropped"
+
+
+def test_games_by_player_name(tmp_path: Path) -> None:
+    """Test that games are recorded under the player's name."""
+    stats = StatsStore(str(tmp_path / "stats.db"))
+    Game(stats, "Alice")
+    Game(stats, "Bob")
+    stats.flush()
+    assert stats.player_stats("Alice")["games"] == 1, "Alice not recorded"
+    assert stats.player_stats("Bob")["games"] == 1, "Bob not recorded"
+    stats.close()
+
+
+def test_failed_write_keeps_batch(tmp_path: Path) -> None:
+    """Test that one failing write does not drop the rest of its batch."""
+    stats = StatsStore(str(tmp_path / "stats.db"))
+    stats.commit(
+        [
+            ("INSERT INTO player_stats (player, games) VALUES (?, 1)", ("A",)),
+            ("INSERT INTO missing_table VALUES (?)", (1,)),
+            ("INSERT INTO player_stats (player, games) VALUES (?, 1)", ("B",)),
+        ]
+    )
+    assert stats.player_stats("A")["games"] == 1, "Write before was lost"
+    assert stats.player_stats("B")["games"] == 1, "Write after was lost"
+    stats.close()